@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+# Streaming responses (e.g. server-sent events) must reach the client unbuffered.
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    # mtime=0 keeps the output deterministic so precompressed bytes are stable.
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(data: bytes, level: int) -> bytes:
+    return brotli.compress(data, quality=min(level, 11))
+
+
+def _zstd(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def available_encodings() -> Dict[str, Callable[[bytes, int], bytes]]:
+    """Codecs usable in this process, in server preference order."""
+    codecs: Dict[str, Callable[[bytes, int], bytes]] = {}
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    if brotli is not None:
+        codecs["br"] = _brotli
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+def choose_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pick the first of ``available`` that the client accepts, honouring ``q=0``.
+
+    An explicit ``name;q=0`` refusal wins over a ``*`` wildcard.
+    """
+    accepted = set()
+    refused = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    refused.add(name)
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    wildcard = "*" in accepted
+    for name in available:
+        if name in refused:
+            continue
+        if name in accepted or wildcard:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """Compress complete response bodies of at least ``minimum_size`` bytes.
+
+    Responses that already carry a ``Content-Encoding`` (such as the
+    precompressed root page) and streamed responses are passed through as-is.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        level: int = COMPRESSION_LEVEL,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.codecs = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = "content-encoding" in headers or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) >= self.minimum_size:
+                    body = self.codecs[encoding](body, self.level)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+                start = None
+                passthrough = True
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedPage:
+    """A static document encoded once up front in every available codec.
+
+    Each encoding gets its own strong ETag (``"<hash>"`` for identity,
+    ``"<hash>-gzip"`` and so on), since the bodies are not byte-identical.
+    """
+
+    def __init__(self, content: str, level: int = 9) -> None:
+        self.identity = content.encode("utf-8")
+        self.digest = hashlib.sha256(self.identity).hexdigest()[:32]
+        self.encoded: Dict[str, bytes] = {
+            name: codec(self.identity, level) for name, codec in available_encodings().items()
+        }
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        if encoding is None:
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    def select(self, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        encoding = choose_encoding(accept_encoding, self.encoded)
+        if encoding is None:
+            return None, self.identity
+        return encoding, self.encoded[encoding]
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        # If-None-Match uses weak comparison (RFC 9110 section 13.1.2).
+        if not if_none_match:
+            return False
+        tags: List[str] = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
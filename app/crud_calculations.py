@@ -1,6 +1,7 @@
+import math
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from . import models, schemas
+from . import models, schemas, crud_events
 from .schemas import CalculationType
 from .calculation_factory import get_operation
 
@@ -13,9 +14,15 @@ def browse_calculations(db: Session, user_id: Optional[int] = None) -> List[mode
 def get_calculation(db: Session, calc_id: int) -> Optional[models.Calculation]:
     return db.query(models.Calculation).filter(models.Calculation.id == calc_id).first()
 
+def compute_result(calc_type: CalculationType, a: float, b: float) -> float:
+    result = get_operation(calc_type, a, b).compute()
+    if math.isnan(result):
+        # e.g. inf - inf; SQLite would store NaN as NULL in a NOT NULL column.
+        raise ValueError(f"{calc_type.value} of {a} and {b} is not a number")
+    return result
+
 def create_calculation(db: Session, calc_in: schemas.CalculationCreate, user_id: Optional[int] = None) -> models.Calculation:
-    op = get_operation(calc_in.type, calc_in.a, calc_in.b)
-    result = op.compute()
+    result = compute_result(calc_in.type, calc_in.a, calc_in.b)
     db_calc = models.Calculation(
         a=calc_in.a,
         b=calc_in.b,
@@ -24,24 +31,29 @@ def create_calculation(db: Session, calc_in: schemas.CalculationCreate, user_id:
         user_id=user_id,
     )
     db.add(db_calc)
+    db.flush()
+    seq = crud_events.record_event(db, crud_events.CREATED, db_calc)
     db.commit()
+    crud_events.notify_committed(seq)
     db.refresh(db_calc)
     return db_calc
 
 def update_calculation(db: Session, calc: models.Calculation, update: schemas.CalculationUpdate) -> models.Calculation:
-    if update.a is not None:
-        calc.a = update.a
-    if update.b is not None:
-        calc.b = update.b
-    if update.type is not None:
-        calc.type = update.type.value
-    op = get_operation(CalculationType(calc.type), calc.a, calc.b)
-    calc.result = op.compute()
+    a = update.a if update.a is not None else calc.a
+    b = update.b if update.b is not None else calc.b
+    calc_type = update.type if update.type is not None else CalculationType(calc.type)
+    # Compute before touching calc so a rejected update leaves it unchanged.
+    result = compute_result(calc_type, a, b)
+    calc.a, calc.b, calc.type, calc.result = a, b, calc_type.value, result
     db.add(calc)
+    seq = crud_events.record_event(db, crud_events.UPDATED, calc)
     db.commit()
+    crud_events.notify_committed(seq)
     db.refresh(calc)
     return calc
 
 def delete_calculation(db: Session, calc: models.Calculation) -> None:
+    seq = crud_events.record_event(db, crud_events.DELETED, calc)
     db.delete(calc)
     db.commit()
+    crud_events.notify_committed(seq)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from . import models
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Highest sequence number committed by this process. Long-poll readers wait on
+# an asyncio event, set from the committing thread, instead of re-querying the
+# table in a loop.
+_lock = threading.Lock()
+_latest_seq = 0
+_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+EVENT_LOCK_ID = 1
+LOCK_EVENT_SEQUENCE = (
+    select(models.CalculationEventLock.id)
+    .where(models.CalculationEventLock.id == EVENT_LOCK_ID)
+    .with_for_update()
+)
+
+def ensure_event_lock(db: Session) -> None:
+    if db.get(models.CalculationEventLock, EVENT_LOCK_ID) is None:
+        db.add(models.CalculationEventLock(id=EVENT_LOCK_ID))
+        db.commit()
+
+def record_event(db: Session, action: str, calc: models.Calculation) -> int:
+    """Stage an event in the caller's transaction and return its sequence number.
+
+    The row is only flushed here; it becomes visible when the caller commits.
+    The event lock row is held FOR UPDATE until then, so writers take ``seq``
+    values in commit order and a reader resuming from ``last_seq`` never
+    skips an event committed late. SQLite ignores FOR UPDATE but already
+    serializes writers.
+    """
+    db.execute(LOCK_EVENT_SEQUENCE).one()
+    event = models.CalculationEvent(
+        action=action,
+        calculation_id=calc.id,
+        user_id=calc.user_id,
+        a=calc.a,
+        b=calc.b,
+        type=calc.type,
+        result=calc.result,
+    )
+    db.add(event)
+    db.flush()
+    return event.seq
+
+def notify_committed(seq: int) -> None:
+    global _latest_seq
+    with _lock:
+        if seq > _latest_seq:
+            _latest_seq = seq
+        waiters = list(_waiters)
+    for loop, event in waiters:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The waiter's loop has already shut down.
+            pass
+
+async def wait_for_events(since: int, timeout: float) -> int:
+    """Wait until an event newer than ``since`` is committed or ``timeout`` expires.
+
+    Returns the highest sequence number known to this process.
+    """
+    waiter = (asyncio.get_running_loop(), asyncio.Event())
+    with _lock:
+        if _latest_seq > since:
+            return _latest_seq
+        _waiters.add(waiter)
+    try:
+        await asyncio.wait_for(waiter[1].wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        with _lock:
+            _waiters.discard(waiter)
+    return _latest_seq
+
+def list_events(
+    db: Session, since: int = 0, user_id: Optional[int] = None, limit: int = 100
+) -> List[models.CalculationEvent]:
+    query = db.query(models.CalculationEvent).filter(models.CalculationEvent.seq > since)
+    if user_id is not None:
+        query = query.filter(models.CalculationEvent.user_id == user_id)
+    return query.order_by(models.CalculationEvent.seq).limit(limit).all()
@@ -0,0 +1,58 @@
+import json
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from . import models, schemas
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+def create_job(db: Session, job_in: schemas.CalculationJobCreate, user_id: Optional[int] = None) -> models.CalculationJob:
+    # Inputs are persisted with the job so a restarted worker can pick it up again.
+    payload = json.dumps([[c.type.value, c.a, c.b] for c in job_in.calculations])
+    db_job = models.CalculationJob(
+        user_id=user_id,
+        status=PENDING,
+        total=len(job_in.calculations),
+        processed=0,
+        attempts=0,
+        payload=payload,
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_job(db: Session, job_id: int) -> Optional[models.CalculationJob]:
+    return db.query(models.CalculationJob).filter(models.CalculationJob.id == job_id).first()
+
+def fail_job(db: Session, job_id: int, error: str) -> None:
+    """Mark an unfinished job failed; finished jobs are left as they are."""
+    db.query(models.CalculationJob).filter(
+        models.CalculationJob.id == job_id,
+        models.CalculationJob.status.in_([PENDING, RUNNING]),
+    ).update({"status": FAILED, "error": error}, synchronize_session=False)
+    db.commit()
+
+def get_job_results(db: Session, job_id: int, offset: int = 0, limit: int = 100) -> List[models.CalculationJobResult]:
+    # Seek on the (job_id, position) primary key rather than OFFSET-scanning.
+    return (
+        db.query(models.CalculationJobResult)
+        .filter(
+            models.CalculationJobResult.job_id == job_id,
+            models.CalculationJobResult.position >= offset,
+        )
+        .order_by(models.CalculationJobResult.position)
+        .limit(limit)
+        .all()
+    )
+
+def get_unfinished_job_ids(db: Session) -> List[int]:
+    rows = (
+        db.query(models.CalculationJob.id)
+        .filter(models.CalculationJob.status.in_([PENDING, RUNNING]))
+        .order_by(models.CalculationJob.id)
+        .all()
+    )
+    return [row.id for row in rows]
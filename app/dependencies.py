@@ -3,7 +3,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from .database import SessionLocal
-from .security import decode_access_token
+from .security import decode_access_token, REFRESH_TOKEN_TYPE
+from .revocation import revoked_tokens
 from . import models
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
@@ -20,8 +21,10 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> models.User:
     payload = decode_access_token(token)
-    if not payload or "sub" not in payload:
+    if not payload or "sub" not in payload or payload.get("type") == REFRESH_TOKEN_TYPE:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if "jti" in payload and revoked_tokens.is_revoked(payload["jti"]):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
     username: str = payload["sub"]
     user = db.query(models.User).filter(models.User.username == username).first()
     if not user:
@@ -0,0 +1,193 @@
+import functools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Set
+from sqlalchemy import insert, update
+from . import models, crud_jobs
+from .calculation_factory import get_operation
+from .database import SessionLocal
+from .schemas import CalculationType
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "500"))
+# A job whose worker process has died this many times is failed, not retried.
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Jobs this process has handed to the pool and not yet seen finish.
+_pending_jobs: Set[int] = set()
+
+def run_job(job_id: int, chunk_size: int = JOB_CHUNK_SIZE) -> None:
+    """Evaluate a persisted job chunk by chunk, resuming from its saved progress.
+
+    Each chunk advances ``processed`` with a compare-and-set and inserts its
+    results in the same transaction. If another worker is running the same job
+    (for example after several processes resumed it at startup), the lost
+    compare-and-set makes this worker back off without touching the job's
+    status. Any other error, including an item that evaluates to NaN (which
+    the results table cannot store), fails the job.
+    """
+    db = SessionLocal()
+    try:
+        job = crud_jobs.get_job(db, job_id)
+        if job is None or job.status not in (crud_jobs.PENDING, crud_jobs.RUNNING):
+            return
+        items = json.loads(job.payload)
+        total, processed = job.total, job.processed
+        started = db.execute(
+            update(models.CalculationJob)
+            .where(
+                models.CalculationJob.id == job_id,
+                models.CalculationJob.status.in_([crud_jobs.PENDING, crud_jobs.RUNNING]),
+            )
+            .values(status=crud_jobs.RUNNING, attempts=models.CalculationJob.attempts + 1)
+        )
+        if started.rowcount != 1:
+            db.rollback()
+            return
+        db.commit()
+        try:
+            while processed < total:
+                chunk = items[processed:processed + chunk_size]
+                rows = []
+                for i, (calc_type, a, b) in enumerate(chunk):
+                    result = get_operation(CalculationType(calc_type), a, b).compute()
+                    if math.isnan(result):
+                        raise ValueError(
+                            f"Calculation {processed + i} ({calc_type} {a!r}, {b!r}) is not a number"
+                        )
+                    rows.append({
+                        "job_id": job_id,
+                        "position": processed + i,
+                        "a": a,
+                        "b": b,
+                        "type": calc_type,
+                        "result": result,
+                    })
+                claimed = db.execute(
+                    update(models.CalculationJob)
+                    .where(models.CalculationJob.id == job_id, models.CalculationJob.processed == processed)
+                    .values(processed=processed + len(rows))
+                )
+                if claimed.rowcount != 1:
+                    db.rollback()
+                    return
+                db.execute(insert(models.CalculationJobResult), rows)
+                db.commit()
+                processed += len(rows)
+        except Exception as exc:
+            db.rollback()
+            crud_jobs.fail_job(db, job_id, str(exc))
+            return
+        db.execute(
+            update(models.CalculationJob)
+            .where(models.CalculationJob.id == job_id, models.CalculationJob.processed == total)
+            .values(status=crud_jobs.COMPLETED, error=None)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: children must not inherit the parent's open DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+def submit_job(job_id: int) -> None:
+    with _executor_lock:
+        _pending_jobs.add(job_id)
+    executor = get_executor()
+    try:
+        future = executor.submit(run_job, job_id)
+    except BrokenProcessPool:
+        restart_broken_pool(executor)
+        return
+    future.add_done_callback(functools.partial(_on_job_done, job_id, executor))
+
+def _on_job_done(job_id: int, executor: ProcessPoolExecutor, future: Future) -> None:
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if isinstance(exc, BrokenProcessPool):
+        restart_broken_pool(executor)
+        return
+    with _executor_lock:
+        _pending_jobs.discard(job_id)
+    if exc is not None:
+        # run_job could not even record its own failure (e.g. the DB was down).
+        logger.error("Calculation job %s crashed", job_id, exc_info=exc)
+        _fail_job_quietly(job_id, f"Worker error: {exc}")
+
+def _fail_job_quietly(job_id: int, error: str) -> None:
+    db = SessionLocal()
+    try:
+        crud_jobs.fail_job(db, job_id, error)
+    except Exception:
+        logger.exception("Could not mark calculation job %s as failed", job_id)
+    finally:
+        db.close()
+
+def restart_broken_pool(broken: ProcessPoolExecutor) -> None:
+    """Replace a pool whose worker died and requeue this process's unfinished jobs."""
+    global _executor
+    with _executor_lock:
+        if _executor is not broken:
+            # Another callback already replaced it.
+            return
+        _executor = None
+        job_ids = sorted(_pending_jobs)
+    broken.shutdown(wait=False, cancel_futures=True)
+    db = SessionLocal()
+    try:
+        attempts = dict(
+            db.query(models.CalculationJob.id, models.CalculationJob.attempts)
+            .filter(models.CalculationJob.id.in_(job_ids))
+            .all()
+        )
+    finally:
+        db.close()
+    for job_id in job_ids:
+        # Queued jobs that never started have not used up an attempt, so only
+        # jobs that keep killing their worker end up here.
+        if attempts.get(job_id, 0) >= JOB_MAX_ATTEMPTS:
+            with _executor_lock:
+                _pending_jobs.discard(job_id)
+            logger.error("Calculation job %s killed its worker %s times; giving up", job_id, JOB_MAX_ATTEMPTS)
+            _fail_job_quietly(job_id, f"Worker process died {JOB_MAX_ATTEMPTS} times while running this job")
+            continue
+        submit_job(job_id)
+
+def resume_unfinished_jobs() -> int:
+    """Requeue jobs left pending or running by a previous process."""
+    db = SessionLocal()
+    try:
+        job_ids = crud_jobs.get_unfinished_job_ids(db)
+    finally:
+        db.close()
+    for job_id in job_ids:
+        submit_job(job_id)
+    return len(job_ids)
+
+def shutdown_executor() -> None:
+    # Unfinished jobs keep their committed progress and are resumed on next start.
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        _pending_jobs.clear()
@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, Response
 from fastapi.responses import HTMLResponse
+from .compression import CompressionMiddleware, PrecompressedPage
 from .database import Base, engine, SessionLocal
-from .routers import users, calculations
-from . import crud_users, schemas
+from .routers import users, calculations, jobs as jobs_router
+from . import crud_events, crud_users, schemas, jobs
+from .revocation import revoked_tokens
 
 Base.metadata.create_all(bind=engine)
 
@@ -22,8 +26,34 @@ def seed_demo_user() -> None:
 
 seed_demo_user()
 
-app = FastAPI(title="User & Calculation API")
+def seed_event_lock() -> None:
+    db = SessionLocal()
+    try:
+        crud_events.ensure_event_lock(db)
+    finally:
+        db.close()
+
+seed_event_lock()
+
+def load_revoked_tokens() -> None:
+    db = SessionLocal()
+    try:
+        revoked_tokens.load(db)
+    finally:
+        db.close()
+
+load_revoked_tokens()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jobs.resume_unfinished_jobs()
+    yield
+    jobs.shutdown_executor()
+
+app = FastAPI(title="User & Calculation API", lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
 app.include_router(users.router)
+app.include_router(jobs_router.router)
 app.include_router(calculations.router)
 
 CALC_HTML = """<!DOCTYPE html>
@@ -142,6 +172,22 @@ CALC_HTML = """<!DOCTYPE html>
 </body>
 </html>"""
 
+CALC_PAGE = PrecompressedPage(CALC_HTML)
+
 @app.get("/", response_class=HTMLResponse)
-def root_calc_page():
-    return CALC_HTML
+def root_calc_page(
+    accept_encoding: str = Header(default=""),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    encoding, body = CALC_PAGE.select(accept_encoding)
+    etag = CALC_PAGE.etag(encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if CALC_PAGE.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=body, headers=headers)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, Text, DateTime
+from sqlalchemy.orm import deferred, relationship
 from .database import Base
 
 class User(Base):
@@ -19,3 +19,50 @@ class Calculation(Base):
     result = Column(Float, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     user = relationship("User", back_populates="calculations")
+
+class CalculationEvent(Base):
+    """Append-only outbox row; ``seq`` is never reused, so it orders all changes."""
+    __tablename__ = "calculation_events"
+    __table_args__ = (
+        Index("ix_calculation_events_user_seq", "user_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    action = Column(String(10), nullable=False)
+    calculation_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    a = Column(Float, nullable=True)
+    b = Column(Float, nullable=True)
+    type = Column(String(20), nullable=True)
+    result = Column(Float, nullable=True)
+
+class CalculationEventLock(Base):
+    """Single row that event writers lock, so ``seq`` order matches commit order."""
+    __tablename__ = "calculation_event_lock"
+    id = Column(Integer, primary_key=True)
+
+class CalculationJob(Base):
+    __tablename__ = "calculation_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String(20), nullable=False, index=True)
+    total = Column(Integer, nullable=False)
+    processed = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Inputs can run to megabytes; load them only when a worker needs them.
+    payload = deferred(Column(Text, nullable=False))
+    error = Column(Text, nullable=True)
+
+class CalculationJobResult(Base):
+    __tablename__ = "calculation_job_results"
+    job_id = Column(Integer, ForeignKey("calculation_jobs.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    a = Column(Float, nullable=False)
+    b = Column(Float, nullable=False)
+    type = Column(String(20), nullable=False)
+    result = Column(Float, nullable=False)
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
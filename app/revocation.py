@@ -0,0 +1,55 @@
+import threading
+from datetime import datetime
+from typing import Dict
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from . import models
+
+class RevocationList:
+    """Revoked token ids kept in memory and mirrored to the revoked_tokens table.
+
+    Lookups never touch the database. Rows are only written when a token is
+    revoked, and the table's primary key makes each revocation a one-time
+    claim, which is what lets refresh-token rotation detect reuse.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._prune_at = 1024
+
+    def load(self, db: Session) -> None:
+        now = datetime.utcnow()
+        db.query(models.RevokedToken).filter(models.RevokedToken.expires_at < now).delete()
+        db.commit()
+        rows = db.query(models.RevokedToken.jti, models.RevokedToken.expires_at).all()
+        with self._lock:
+            self._revoked = {row.jti: row.expires_at for row in rows}
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> bool:
+        """Revoke ``jti``; returns False if it had already been revoked."""
+        if self.is_revoked(jti):
+            return False
+        db.add(models.RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            db.commit()
+            newly_revoked = True
+        except IntegrityError:
+            # Revoked by another process since this one loaded the list.
+            db.rollback()
+            newly_revoked = False
+        with self._lock:
+            self._revoked[jti] = expires_at
+            if len(self._revoked) >= self._prune_at:
+                self._prune(datetime.utcnow())
+        return newly_revoked
+
+    def _prune(self, now: datetime) -> None:
+        # Expired tokens are rejected by decode_access_token, so their ids can go.
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp >= now}
+        self._prune_at = max(1024, 2 * len(self._revoked))
+
+revoked_tokens = RevocationList()
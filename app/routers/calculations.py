@@ -1,7 +1,9 @@
+import time
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from .. import schemas, crud_calculations, models
+from .. import schemas, crud_calculations, crud_events, models
 from ..dependencies import get_db, get_current_user
 
 router = APIRouter(prefix="/calculations", tags=["calculations"])
@@ -21,7 +23,45 @@ def add_calculation(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud_calculations.create_calculation(db, calc_in, user_id=current_user.id)
+    try:
+        return crud_calculations.create_calculation(db, calc_in, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def fetch_changes(db: Session, since: int, user_id: int, limit: int) -> List[models.CalculationEvent]:
+    try:
+        return crud_events.list_events(db, since=since, user_id=user_id, limit=limit)
+    finally:
+        # Hand the pooled connection back before the caller starts waiting.
+        db.close()
+
+
+@router.get("/changes", response_model=schemas.CalculationChanges)
+async def calculation_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=30, description="Seconds to long-poll when no events are pending"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    # Async so a waiting poller holds neither a threadpool thread nor a DB connection.
+    user_id = current_user.id
+    events = await run_in_threadpool(fetch_changes, db, since, user_id, limit)
+    deadline = time.monotonic() + wait
+    seen = since
+    while not events:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        latest = await crud_events.wait_for_events(seen, remaining)
+        if latest <= seen:
+            break
+        # Something was committed, possibly for another user; only query past it.
+        seen = latest
+        events = await run_in_threadpool(fetch_changes, db, since, user_id, limit)
+    last_seq = events[-1].seq if events else since
+    return {"events": events, "last_seq": last_seq}
 
 
 @router.get("/{calc_id}", response_model=schemas.CalculationRead)
@@ -47,7 +87,10 @@ def edit_calculation(
     calc = crud_calculations.get_calculation(db, calc_id)
     if not calc or calc.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Calculation not found")
-    return crud_calculations.update_calculation(db, calc, update)
+    try:
+        return crud_calculations.update_calculation(db, calc, update)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{calc_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from .. import schemas, crud_jobs, jobs, models
+from ..dependencies import get_db, get_current_user
+
+router = APIRouter(prefix="/calculations/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=schemas.CalculationJobRead, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(
+    job_in: schemas.CalculationJobCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    job = crud_jobs.create_job(db, job_in, user_id=current_user.id)
+    jobs.submit_job(job.id)
+    return job
+
+
+@router.get("/{job_id}", response_model=schemas.CalculationJobDetail)
+def read_job(
+    job_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    job = crud_jobs.get_job(db, job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    results = crud_jobs.get_job_results(db, job_id, offset=offset, limit=limit)
+    return schemas.CalculationJobDetail(
+        id=job.id,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        error=job.error,
+        results=results,
+    )
@@ -1,13 +1,32 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from .. import schemas, crud_users
-from ..dependencies import get_db
-from ..security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..dependencies import get_db, oauth2_scheme
+from ..revocation import revoked_tokens
+from ..security import (
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_TYPE,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+def issue_tokens(username: str) -> dict:
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = create_access_token(data={"sub": username}, expires_delta=access_token_expires)
+    refresh_token, _, _ = create_refresh_token(username)
+    return {"access_token": token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+def decode_refresh_token(refresh_token: str) -> dict:
+    payload = decode_access_token(refresh_token)
+    if not payload or payload.get("type") != REFRESH_TOKEN_TYPE or "jti" not in payload or "sub" not in payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return payload
+
 @router.post("/register", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
 def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     try:
@@ -24,6 +43,33 @@ def login(
     user = crud_users.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
-    return {"access_token": token, "token_type": "bearer"}
+    return issue_tokens(user.username)
+
+@router.post("/refresh")
+def refresh(body: schemas.TokenRefresh, db: Session = Depends(get_db)):
+    # Rotation: the presented refresh token is revoked as new tokens are issued,
+    # so replaying it fails. No password verification is needed here.
+    payload = decode_refresh_token(body.refresh_token)
+    expires_at = datetime.utcfromtimestamp(payload["exp"])
+    if not revoked_tokens.revoke(db, payload["jti"], expires_at):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+    return issue_tokens(payload["sub"])
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    body: schemas.TokenRefresh,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    refresh_payload = decode_refresh_token(body.refresh_token)
+    access_payload = decode_access_token(token)
+    if (
+        not access_payload
+        or access_payload.get("type") == REFRESH_TOKEN_TYPE
+        or access_payload.get("sub") != refresh_payload["sub"]
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    for payload in (access_payload, refresh_payload):
+        if "jti" in payload:
+            revoked_tokens.revoke(db, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+    return None
@@ -1,6 +1,9 @@
+import os
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, EmailStr, field_validator, ValidationInfo
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator, ValidationInfo
+
+JOB_MAX_ITEMS = int(os.getenv("JOB_MAX_ITEMS", "100000"))
 
 class CalculationType(str, Enum):
     add = "add"
@@ -24,6 +27,9 @@ class UserLogin(BaseModel):
     username: str
     password: str
 
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
 class CalculationBase(BaseModel):
     type: CalculationType
     a: float
@@ -55,3 +61,51 @@ class CalculationRead(BaseModel):
     user_id: Optional[int] = None
     class Config:
         from_attributes = True
+
+class CalculationEventRead(BaseModel):
+    seq: int
+    action: str
+    calculation_id: int
+    user_id: Optional[int] = None
+    a: Optional[float] = None
+    b: Optional[float] = None
+    type: Optional[CalculationType] = None
+    result: Optional[float] = None
+    class Config:
+        from_attributes = True
+
+class CalculationChanges(BaseModel):
+    events: List[CalculationEventRead]
+    last_seq: int
+
+class CalculationJobCreate(BaseModel):
+    calculations: List[CalculationCreate] = Field(max_length=JOB_MAX_ITEMS)
+
+    @field_validator("calculations", mode="before")
+    @classmethod
+    def not_too_many(cls, v):
+        # max_length alone is only checked after every item has been validated.
+        if isinstance(v, (list, tuple)) and len(v) > JOB_MAX_ITEMS:
+            raise ValueError(f"a job may contain at most {JOB_MAX_ITEMS} calculations")
+        return v
+
+class CalculationJobRead(BaseModel):
+    id: int
+    status: str
+    total: int
+    processed: int
+    error: Optional[str] = None
+    class Config:
+        from_attributes = True
+
+class CalculationJobResultRead(BaseModel):
+    position: int
+    a: float
+    b: float
+    type: CalculationType
+    result: float
+    class Config:
+        from_attributes = True
+
+class CalculationJobDetail(CalculationJobRead):
+    results: List[CalculationJobResultRead]
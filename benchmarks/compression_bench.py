@@ -0,0 +1,40 @@
+"""Bytes-on-wire and compression CPU for ``GET /calculations/`` payloads.
+
+Run with ``python -m benchmarks.compression_bench``.
+"""
+import json
+import time
+
+from app import compression
+
+LIST_SIZES = (1, 10, 100, 1000, 10000)
+REPEAT = 50
+
+
+def make_payload(n: int) -> bytes:
+    ops = ("add", "sub", "mul", "div")
+    rows = [
+        {"id": i, "a": i * 1.5, "b": (i % 7) + 1.0, "type": ops[i % 4], "result": i * 0.25, "user_id": 1}
+        for i in range(n)
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    codecs = compression.available_encodings()
+    print(f"threshold={compression.COMPRESSION_MINIMUM_SIZE}B level={compression.COMPRESSION_LEVEL}")
+    print(f"{'rows':>6} {'identity':>10} " + " ".join(f"{name + ' B':>10} {name + ' us':>10}" for name in codecs))
+    for n in LIST_SIZES:
+        body = make_payload(n)
+        cols = []
+        for codec in codecs.values():
+            start = time.process_time()
+            for _ in range(REPEAT):
+                out = codec(body, compression.COMPRESSION_LEVEL)
+            cpu_us = (time.process_time() - start) / REPEAT * 1e6
+            cols.append(f"{len(out):>10} {cpu_us:>10.1f}")
+        print(f"{n:>6} {len(body):>10} " + " ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def login() -> Callable[[str, str], dict]:
+    """Log in through the API and return the token response."""
+    def _login(username: str, password: str) -> dict:
+        # OAuth2PasswordRequestForm is urlencoded body
+        resp = client.post(
+            "/users/login",
+            data={"username": username, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+    return _login
+
+
+@pytest.fixture
+def register_and_login(login) -> Callable[[str, str], dict]:
+    """Register a new user and return bearer headers for it."""
+    def _register_and_login(username: str, password: str) -> dict:
+        resp = client.post(
+            "/users/register",
+            json={"username": username, "email": f"{username}@example.com", "password": password},
+        )
+        assert resp.status_code == 201, resp.text
+        return {"Authorization": f"Bearer {login(username, password)['access_token']}"}
+    return _register_and_login
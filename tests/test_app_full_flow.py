@@ -256,3 +256,21 @@ def test_division_by_zero_validation_error():
     payload = {"type": "div", "a": 10, "b": 0}
     resp = client.post("/calculations/", json=payload, headers=headers)
     assert resp.status_code == 422
+
+
+def test_nan_result_is_rejected():
+    token = get_token_for("demo", "Test123!")
+    headers = {"Authorization": f"Bearer {token}"}
+    # inf - inf has no numeric result.
+    resp = client.post("/calculations/", json={"type": "sub", "a": "inf", "b": "inf"}, headers=headers)
+    assert resp.status_code == 400
+    assert "not a number" in resp.json()["detail"]
+
+    resp = client.post("/calculations/", json={"type": "add", "a": "inf", "b": "inf"}, headers=headers)
+    assert resp.status_code == 201
+    calc_id = resp.json()["id"]
+    resp = client.patch(f"/calculations/{calc_id}", json={"type": "sub"}, headers=headers)
+    assert resp.status_code == 400
+    # The rejected update left the calculation as it was.
+    resp = client.get(f"/calculations/{calc_id}", headers=headers)
+    assert resp.json()["type"] == "add"
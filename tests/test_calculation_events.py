@@ -0,0 +1,116 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.database import SessionLocal, engine
+from app import crud_calculations, crud_events, schemas
+
+client = TestClient(app)
+
+
+def test_crud_changes_are_recorded_in_order_and_scoped_to_owner(register_and_login):
+    headers = register_and_login("eventuser", "Event123!")
+    other = register_and_login("eventother", "Other123!")
+
+    resp = client.post("/calculations/", json={"type": "add", "a": 1, "b": 2}, headers=headers)
+    calc_id = resp.json()["id"]
+    client.patch(f"/calculations/{calc_id}", json={"type": "mul"}, headers=headers)
+    client.delete(f"/calculations/{calc_id}", headers=headers)
+    client.post("/calculations/", json={"type": "sub", "a": 9, "b": 1}, headers=other)
+
+    resp = client.get("/calculations/changes", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    events = body["events"]
+    assert [e["action"] for e in events] == ["created", "updated", "deleted"]
+    assert all(e["calculation_id"] == calc_id for e in events)
+    assert [e["result"] for e in events] == [3, 2, 2]
+    seqs = [e["seq"] for e in events]
+    assert seqs == sorted(seqs)
+    assert body["last_seq"] == seqs[-1]
+
+    # Resuming from the last sequence returns nothing new.
+    resp = client.get("/calculations/changes", params={"since": body["last_seq"]}, headers=headers)
+    assert resp.json() == {"events": [], "last_seq": body["last_seq"]}
+
+    resp = client.get("/calculations/changes", params={"since": seqs[0], "limit": 1}, headers=headers)
+    assert [e["seq"] for e in resp.json()["events"]] == [seqs[1]]
+
+
+def test_long_poll_wakes_up_on_commit(register_and_login):
+    headers = register_and_login("polluser", "Poll123!")
+    db = SessionLocal()
+    since = max([e.seq for e in crud_events.list_events(db, limit=10**6)] or [0])
+    db.close()
+
+    def create_later():
+        time.sleep(0.2)
+        client.post("/calculations/", json={"type": "div", "a": 9, "b": 3}, headers=headers)
+
+    worker = threading.Thread(target=create_later)
+    worker.start()
+    started = time.monotonic()
+    resp = client.get("/calculations/changes", params={"since": since, "wait": 5}, headers=headers)
+    worker.join()
+    assert time.monotonic() - started < 5
+    events = resp.json()["events"]
+    assert [e["action"] for e in events] == ["created"]
+    assert events[0]["result"] == 3
+
+
+def test_long_poll_times_out_with_no_events(register_and_login):
+    headers = register_and_login("idleuser", "Idle123!")
+    resp = client.get("/calculations/changes", params={"wait": 0.1}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"events": [], "last_seq": 0}
+
+
+def test_idle_long_polls_do_not_starve_other_requests(register_and_login):
+    headers = register_and_login("crowduser", "Crowd123!")
+    # More pollers than the engine's pool (5 connections + 10 overflow).
+    pollers = 20
+    statuses = []
+
+    def poll():
+        resp = client.get("/calculations/changes", params={"wait": 3}, headers=headers)
+        statuses.append(resp.status_code)
+
+    threads = [threading.Thread(target=poll) for _ in range(pollers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+
+    started = time.monotonic()
+    resp = client.get("/calculations/", headers=headers)
+    elapsed = time.monotonic() - started
+    for thread in threads:
+        thread.join()
+    assert resp.status_code == 200
+    assert elapsed < 1.5
+    assert statuses == [200] * pollers
+
+
+def test_event_writers_lock_the_sequence_before_taking_a_seq():
+    compiled = str(crud_events.LOCK_EVENT_SEQUENCE.compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE" in compiled
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    db = SessionLocal()
+    try:
+        calc_in = schemas.CalculationCreate(type=schemas.CalculationType.add, a=1, b=1)
+        crud_calculations.create_calculation(db, calc_in)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", capture)
+    lock = next(i for i, s in enumerate(statements) if "FROM calculation_event_lock" in s)
+    insert = next(i for i, s in enumerate(statements) if s.startswith("INSERT INTO calculation_events"))
+    assert lock < insert
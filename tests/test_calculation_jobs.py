@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+from app.main import app
+from app.database import SessionLocal
+from app import crud_jobs, jobs, models, schemas
+
+client = TestClient(app)
+
+
+def make_job(n: int) -> schemas.CalculationJobCreate:
+    ops = list(schemas.CalculationType)
+    return schemas.CalculationJobCreate(
+        calculations=[
+            schemas.CalculationCreate(type=ops[i % 4], a=i, b=(i % 5) + 1) for i in range(n)
+        ]
+    )
+
+
+def wait_for_job(job_id: int, headers: dict) -> dict:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        body = client.get(f"/calculations/jobs/{job_id}", headers=headers).json()
+        if body["status"] in (crud_jobs.COMPLETED, crud_jobs.FAILED):
+            break
+        time.sleep(0.1)
+    return body
+
+
+def test_job_runs_in_process_pool_and_results_are_pageable(register_and_login):
+    headers = register_and_login("jobuser", "Job123!")
+    payload = make_job(25).model_dump(mode="json")
+    resp = client.post("/calculations/jobs", json=payload, headers=headers)
+    assert resp.status_code == 202, resp.text
+    job = resp.json()
+    assert job["total"] == 25 and job["status"] == crud_jobs.PENDING
+
+    body = wait_for_job(job["id"], headers)
+    assert body["status"] == crud_jobs.COMPLETED
+    assert body["processed"] == 25
+
+    resp = client.get(f"/calculations/jobs/{job['id']}", params={"offset": 20, "limit": 10}, headers=headers)
+    results = resp.json()["results"]
+    assert [r["position"] for r in results] == [20, 21, 22, 23, 24]
+    assert results[0] == {"position": 20, "a": 20, "b": 1, "type": "add", "result": 21}
+
+    other = register_and_login("jobother", "Other123!")
+    resp = client.get(f"/calculations/jobs/{job['id']}", headers=other)
+    assert resp.status_code == 404
+
+
+def test_run_job_resumes_from_committed_progress():
+    db = SessionLocal()
+    job = crud_jobs.create_job(db, make_job(7))
+    # Simulate a worker that committed the first chunk and then died.
+    db.add_all(
+        models.CalculationJobResult(job_id=job.id, position=i, a=i, b=1, type="add", result=-1)
+        for i in range(3)
+    )
+    job.processed = 3
+    job.status = crud_jobs.RUNNING
+    db.commit()
+    assert job.id in crud_jobs.get_unfinished_job_ids(db)
+
+    jobs.run_job(job.id, chunk_size=2)
+
+    db.refresh(job)
+    assert job.status == crud_jobs.COMPLETED and job.processed == 7
+    results = crud_jobs.get_job_results(db, job.id)
+    assert [r.position for r in results] == list(range(7))
+    # Already-committed rows are not recomputed.
+    assert [r.result for r in results[:3]] == [-1, -1, -1]
+    assert results[6].result == 6 * 2  # mul
+    assert job.id not in crud_jobs.get_unfinished_job_ids(db)
+    db.close()
+
+
+def test_oversized_job_is_rejected(register_and_login):
+    headers = register_and_login("bigjobuser", "Big123!")
+    item = {"type": "add", "a": 1, "b": 2}
+    payload = {"calculations": [item] * (schemas.JOB_MAX_ITEMS + 1)}
+    resp = client.post("/calculations/jobs", json=payload, headers=headers)
+    assert resp.status_code == 422
+    assert f"at most {schemas.JOB_MAX_ITEMS}" in resp.text
+
+
+def test_job_with_a_nan_result_fails(register_and_login):
+    headers = register_and_login("nanjobuser", "NanJob123!")
+    # inf - inf is NaN, which the results table cannot store.
+    payload = {"calculations": [{"type": "add", "a": 1, "b": 2}, {"type": "sub", "a": "inf", "b": "inf"}]}
+    resp = client.post("/calculations/jobs", json=payload, headers=headers)
+    assert resp.status_code == 202, resp.text
+
+    body = wait_for_job(resp.json()["id"], headers)
+    assert body["status"] == crud_jobs.FAILED
+    assert "Calculation 1" in body["error"] and "not a number" in body["error"]
+
+
+def test_concurrent_workers_on_one_job_never_fail_it():
+    db = SessionLocal()
+    job = crud_jobs.create_job(db, make_job(200))
+    statuses = []
+
+    def watch():
+        watcher = SessionLocal()
+        while not done.is_set():
+            statuses.append(crud_jobs.get_job(watcher, job.id).status)
+            watcher.rollback()
+        watcher.close()
+
+    done = threading.Event()
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    workers = [threading.Thread(target=jobs.run_job, args=(job.id, 3)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done.set()
+    watcher.join()
+
+    db.refresh(job)
+    assert job.status == crud_jobs.COMPLETED
+    assert job.error is None
+    assert crud_jobs.FAILED not in statuses
+    results = crud_jobs.get_job_results(db, job.id, limit=1000)
+    assert [r.position for r in results] == list(range(200))
+    db.close()
+
+
+def test_status_reads_do_not_load_the_payload():
+    db = SessionLocal()
+    job_id = crud_jobs.create_job(db, make_job(3)).id
+    db.expunge_all()
+    job = crud_jobs.get_job(db, job_id)
+    assert "payload" in inspect(job).unloaded
+    db.close()
+
+
+def test_jobs_survive_a_crashed_pool_worker(register_and_login):
+    headers = register_and_login("crashjobuser", "Crash123!")
+    crashed = jobs.get_executor().submit(os._exit, 1)
+    try:
+        crashed.result(timeout=60)
+    except BrokenProcessPool:
+        pass
+
+    resp = client.post("/calculations/jobs", json=make_job(4).model_dump(mode="json"), headers=headers)
+    assert resp.status_code == 202, resp.text
+    assert wait_for_job(resp.json()["id"], headers)["status"] == crud_jobs.COMPLETED
+
+
+def test_in_flight_jobs_are_requeued_when_the_pool_breaks():
+    db = SessionLocal()
+    job = crud_jobs.create_job(db, make_job(5))
+    executor = jobs.get_executor()
+    jobs._pending_jobs.add(job.id)
+    broken = Future()
+    broken.set_exception(BrokenProcessPool("worker died"))
+
+    jobs._on_job_done(job.id, executor, broken)
+
+    assert jobs.get_executor() is not executor
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        db.refresh(job)
+        if job.status == crud_jobs.COMPLETED:
+            break
+        time.sleep(0.1)
+    assert job.status == crud_jobs.COMPLETED and job.processed == 5
+    db.close()
+
+
+def test_job_that_keeps_breaking_the_pool_is_failed():
+    db = SessionLocal()
+    job = crud_jobs.create_job(db, make_job(5))
+    job.status, job.attempts = crud_jobs.RUNNING, jobs.JOB_MAX_ATTEMPTS
+    db.commit()
+    executor = jobs.get_executor()
+    jobs._pending_jobs.add(job.id)
+    broken = Future()
+    broken.set_exception(BrokenProcessPool("worker died"))
+
+    jobs._on_job_done(job.id, executor, broken)
+
+    db.refresh(job)
+    assert job.status == crud_jobs.FAILED
+    assert f"died {jobs.JOB_MAX_ATTEMPTS} times" in job.error
+    assert job.id not in jobs._pending_jobs
+    db.close()
+
+
+def test_unexpected_worker_errors_are_logged_and_persisted(caplog):
+    db = SessionLocal()
+    job = crud_jobs.create_job(db, make_job(2))
+    jobs._pending_jobs.add(job.id)
+    crashed = Future()
+    crashed.set_exception(OperationalError("UPDATE calculation_jobs", {}, Exception("database is locked")))
+
+    jobs._on_job_done(job.id, jobs.get_executor(), crashed)
+
+    db.refresh(job)
+    assert job.status == crud_jobs.FAILED
+    assert "database is locked" in job.error
+    assert job.id not in jobs._pending_jobs
+    assert any(f"job {job.id} crashed" in r.getMessage() for r in caplog.records)
+    db.close()
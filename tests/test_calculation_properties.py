@@ -0,0 +1,153 @@
+import math
+import operator
+
+import pytest
+from hypothesis import assume, given, settings, strategies as st
+from pydantic import ValidationError
+
+from app.main import app  # noqa: F401  (creates tables and the demo user)
+from app.database import SessionLocal
+from app import calculation_factory, crud_calculations, crud_jobs, crud_users, jobs, schemas
+
+OPERATION_CLASSES = {
+    schemas.CalculationType.add: calculation_factory.AddOperation,
+    schemas.CalculationType.sub: calculation_factory.SubOperation,
+    schemas.CalculationType.mul: calculation_factory.MulOperation,
+    schemas.CalculationType.div: calculation_factory.DivOperation,
+}
+
+# Independent of calculation_factory, so a fast path that changes float
+# semantics disagrees with it.
+ORACLE = {
+    schemas.CalculationType.add: operator.add,
+    schemas.CalculationType.sub: operator.sub,
+    schemas.CalculationType.mul: operator.mul,
+    schemas.CalculationType.div: operator.truediv,
+}
+
+# Full IEEE-754 range, including NaN, +/-inf and signed zeros.
+any_float = st.floats(allow_nan=True, allow_infinity=True)
+special_float = st.sampled_from([0.0, -0.0, math.inf, -math.inf, math.nan, 5e-324, 1.7976931348623157e308])
+operand = st.one_of(any_float, special_float)
+calc_type = st.sampled_from(list(schemas.CalculationType))
+
+
+def same_float(x: float, y: float) -> bool:
+    """Bitwise-style equality: NaN matches NaN and 0.0 does not match -0.0."""
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    return x == y and math.copysign(1.0, x) == math.copysign(1.0, y)
+
+
+def same_stored_float(stored: float, expected: float) -> bool:
+    """Equality after a round trip through SQLite, which drops the sign of zero."""
+    if expected == 0:
+        return stored == 0
+    return same_float(stored, expected)
+
+
+def oracle_result(t: schemas.CalculationType, a: float, b: float) -> float:
+    return ORACLE[t](a, b)
+
+
+@pytest.fixture(scope="module")
+def owner_id():
+    db = SessionLocal()
+    user = crud_users.get_user_by_username(db, "propuser") or crud_users.create_user(
+        db, schemas.UserCreate(username="propuser", email="propuser@example.com", password="Prop123!")
+    )
+    db.close()
+    return user.id
+
+
+@given(t=calc_type, a=operand, b=operand)
+def test_get_operation_matches_oracle(t, a, b):
+    assume(not (t == schemas.CalculationType.div and b == 0))
+    op = calculation_factory.get_operation(t, a, b)
+    assert isinstance(op, OPERATION_CLASSES[t])
+    assert same_float(op.compute(), oracle_result(t, a, b))
+
+
+@given(a=operand, b=st.sampled_from([0.0, -0.0]))
+def test_division_by_any_zero_is_rejected(a, b):
+    with pytest.raises(ValidationError):
+        schemas.CalculationCreate(type=schemas.CalculationType.div, a=a, b=b)
+    with pytest.raises(ZeroDivisionError):
+        calculation_factory.get_operation(schemas.CalculationType.div, a, b).compute()
+
+
+@given(t=calc_type, a=operand, b=operand)
+def test_validation_only_rejects_zero_divisors(t, a, b):
+    if t == schemas.CalculationType.div and b == 0:
+        with pytest.raises(ValidationError):
+            schemas.CalculationCreate(type=t, a=a, b=b)
+    else:
+        calc = schemas.CalculationCreate(type=t, a=a, b=b)
+        assert same_float(calc.a, a) and same_float(calc.b, b)
+
+
+@settings(max_examples=50, deadline=None)
+@given(t=calc_type, a=operand, b=operand, new_t=calc_type)
+def test_crud_results_and_ownership_match_oracle(owner_id, t, a, b, new_t):
+    assume(not (schemas.CalculationType.div in (t, new_t) and b == 0))
+    # SQLite cannot store a NaN result, so those are rejected with ValueError
+    # (a 400 from the API). It also stores -0.0 as 0.0, so persisted results
+    # are compared with same_stored_float.
+    calc_in = schemas.CalculationCreate(type=t, a=a, b=b)
+    db = SessionLocal()
+    try:
+        if math.isnan(oracle_result(t, a, b)):
+            with pytest.raises(ValueError):
+                crud_calculations.create_calculation(db, calc_in, user_id=owner_id)
+            return
+        created = crud_calculations.create_calculation(db, calc_in, user_id=owner_id)
+        assert created.user_id == owner_id
+        assert same_stored_float(created.result, oracle_result(t, a, b))
+
+        if math.isnan(oracle_result(new_t, a, b)):
+            with pytest.raises(ValueError):
+                crud_calculations.update_calculation(db, created, schemas.CalculationUpdate(type=new_t))
+            db.refresh(created)
+            assert created.type == t.value
+            updated = created
+        else:
+            updated = crud_calculations.update_calculation(db, created, schemas.CalculationUpdate(type=new_t))
+            assert updated.user_id == owner_id
+            assert same_stored_float(updated.result, oracle_result(new_t, a, b))
+        assert any(c.id == updated.id for c in crud_calculations.browse_calculations(db, user_id=owner_id))
+        crud_calculations.delete_calculation(db, updated)
+    finally:
+        db.close()
+
+
+@settings(max_examples=20, deadline=None)
+@given(
+    items=st.lists(st.tuples(calc_type, operand, operand), min_size=1, max_size=20),
+    chunk_size=st.integers(min_value=1, max_value=7),
+)
+def test_job_chunks_match_oracle(owner_id, items, chunk_size):
+    items = [(t, a, b) for t, a, b in items if not (t == schemas.CalculationType.div and b == 0)]
+    assume(items)
+    expected = [oracle_result(t, a, b) for t, a, b in items]
+    first_nan = next((i for i, r in enumerate(expected) if math.isnan(r)), None)
+    db = SessionLocal()
+    try:
+        job_in = schemas.CalculationJobCreate(
+            calculations=[schemas.CalculationCreate(type=t, a=a, b=b) for t, a, b in items]
+        )
+        job = crud_jobs.create_job(db, job_in, user_id=owner_id)
+        jobs.run_job(job.id, chunk_size=chunk_size)
+        db.refresh(job)
+        results = crud_jobs.get_job_results(db, job.id, limit=len(items))
+        if first_nan is None:
+            assert job.status == crud_jobs.COMPLETED
+            assert len(results) == len(items)
+        else:
+            # A NaN fails the job; only whole chunks before it were committed.
+            assert job.status == crud_jobs.FAILED
+            assert f"Calculation {first_nan} " in job.error
+            assert len(results) == first_nan // chunk_size * chunk_size
+        for row, value in zip(results, expected):
+            assert same_stored_float(row.result, value)
+    finally:
+        db.close()
@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+
+from app.main import app, CALC_HTML
+from app import compression
+
+client = TestClient(app)
+
+
+def test_choose_encoding_respects_preference_and_q_zero():
+    assert compression.choose_encoding("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert compression.choose_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "br"
+    assert compression.choose_encoding("gzip;q=0", ["gzip"]) is None
+    assert compression.choose_encoding("*", ["gzip"]) == "gzip"
+    assert compression.choose_encoding("gzip;q=0, *", ["gzip"]) is None
+    assert compression.choose_encoding("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert compression.choose_encoding("*;q=0, gzip", ["br", "gzip"]) == "gzip"
+    assert compression.choose_encoding("", ["gzip"]) is None
+
+
+def test_root_page_is_precompressed_and_revalidates_with_etag():
+    resp = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["cache-control"] == "no-cache"
+    gzip_etag = resp.headers["etag"]
+    assert resp.text == CALC_HTML
+
+    resp = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    identity_etag = resp.headers["etag"]
+    # Strong validators must differ between content-codings.
+    assert identity_etag != gzip_etag
+
+    resp = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == gzip_etag
+    assert resp.content == b""
+
+    resp = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": f"W/{identity_etag}"})
+    assert resp.status_code == 304
+
+    # A cached gzip body does not validate the identity representation.
+    resp = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+    assert resp.status_code == 200
+    assert resp.text == CALC_HTML
+
+
+def test_small_responses_skip_compression_and_large_ones_are_gzipped(login):
+    headers = {"Authorization": f"Bearer {login('demo', 'Test123!')['access_token']}", "Accept-Encoding": "gzip"}
+    resp = client.post("/calculations/", json={"type": "add", "a": 1, "b": 2}, headers=headers)
+    assert resp.status_code == 201
+    assert "content-encoding" not in resp.headers
+
+    for i in range(compression.COMPRESSION_MINIMUM_SIZE // 50 + 1):
+        client.post("/calculations/", json={"type": "mul", "a": i, "b": 2}, headers=headers)
+
+    resp = client.get("/calculations/", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert len(resp.json()) > 1
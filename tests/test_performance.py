@@ -0,0 +1,88 @@
+"""Micro-benchmarks checked against tests/benchmark_baseline.json.
+
+These tests carry the ``perf`` marker and are skipped by the default
+``pytest`` run. CI runs them in a separate step with
+``pytest -m perf --no-cov tests/test_performance.py``.
+
+Medians are stored as multiples of a fixed pure-Python calibration workload
+timed on the same host, so the baseline carries over between machines. A
+benchmark fails when its ratio is more than BENCHMARK_REGRESSION_THRESHOLD
+(a fraction, default 1.0 = twice as slow) above the baseline. Re-record with
+``BENCHMARK_UPDATE_BASELINE=1 pytest -m perf --no-cov tests/test_performance.py``.
+"""
+import json
+import os
+import statistics
+import timeit
+from pathlib import Path
+
+import pytest
+
+from app.main import app  # noqa: F401  (creates tables and the demo user)
+from app.database import SessionLocal
+from app import calculation_factory, crud_calculations, crud_users, dependencies, schemas, security
+
+pytestmark = pytest.mark.perf
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "1.0"))
+
+
+@pytest.fixture(scope="module")
+def calibration() -> float:
+    """Median seconds for one run of a fixed workload on this host."""
+    timings = timeit.repeat(
+        "sorted(data)",
+        setup="import random; random.seed(0); data = [random.random() for _ in range(10000)]",
+        number=10,
+        repeat=15,
+    )
+    return statistics.median(timings) / 10
+
+
+def check_against_baseline(benchmark, calibration: float, name: str) -> None:
+    if benchmark.disabled:
+        return
+    ratio = benchmark.stats.stats.median / calibration
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    if os.getenv("BENCHMARK_UPDATE_BASELINE"):
+        baseline[name] = float(f"{ratio:.3g}")
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        return
+    assert name in baseline, f"no baseline recorded for {name}"
+    limit = baseline[name] * (1 + THRESHOLD)
+    assert ratio <= limit, f"{name}: {ratio:.3g}x calibration exceeds {limit:.3g}x"
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def test_get_operation_speed(benchmark, calibration):
+    op = benchmark(calculation_factory.get_operation, schemas.CalculationType.div, 7.0, 2.0)
+    assert op.compute() == 3.5
+    check_against_baseline(benchmark, calibration, "get_operation")
+
+
+def test_create_calculation_speed(benchmark, calibration, db):
+    user = crud_users.get_user_by_username(db, "demo")
+    calc_in = schemas.CalculationCreate(type=schemas.CalculationType.add, a=1, b=2)
+    created = benchmark.pedantic(
+        crud_calculations.create_calculation,
+        args=(db, calc_in),
+        kwargs={"user_id": user.id},
+        rounds=100,
+        warmup_rounds=5,
+    )
+    assert created.result == 3
+    check_against_baseline(benchmark, calibration, "create_calculation")
+
+
+def test_get_current_user_speed(benchmark, calibration, db):
+    token = security.create_access_token({"sub": "demo"})
+    user = benchmark(dependencies.get_current_user, token=token, db=db)
+    assert user.username == "demo"
+    check_against_baseline(benchmark, calibration, "get_current_user")
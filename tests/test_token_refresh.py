@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app import security
+from app.revocation import RevocationList, revoked_tokens
+
+client = TestClient(app)
+
+
+def test_refresh_rotates_tokens_without_password_check(monkeypatch, login):
+    client.post(
+        "/users/register",
+        json={"username": "refreshuser", "email": "refreshuser@example.com", "password": "Refresh123!"},
+    )
+    tokens = login("refreshuser", "Refresh123!")
+    assert "refresh_token" in tokens
+
+    def fail_verify(*args, **kwargs):
+        raise AssertionError("refresh must not verify the password")
+
+    monkeypatch.setattr(security.pwd_context, "verify", fail_verify)
+    resp = client.post("/users/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200, resp.text
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    resp = client.get("/calculations/", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert resp.status_code == 200
+
+    # The old refresh token was consumed by the rotation.
+    resp = client.post("/users/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+    # Refresh tokens are not accepted as access tokens, and vice versa.
+    resp = client.get("/calculations/", headers={"Authorization": f"Bearer {rotated['refresh_token']}"})
+    assert resp.status_code == 401
+    resp = client.post("/users/refresh", json={"refresh_token": rotated["access_token"]})
+    assert resp.status_code == 401
+
+
+def test_logout_revokes_both_tokens(login):
+    tokens = login("demo", "Test123!")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    resp = client.post("/users/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert resp.status_code == 204
+
+    resp = client.get("/calculations/", headers=headers)
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Token has been revoked"
+    resp = client.post("/users/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+
+def test_logout_rejects_a_refresh_token_as_bearer(login):
+    tokens = login("demo", "Test123!")
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    resp = client.post("/users/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert resp.status_code == 401
+
+    # Nothing was revoked, so the refresh token still works.
+    resp = client.post("/users/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200
+
+
+def test_revocation_list_is_reloaded_from_database():
+    _, jti, expires_at = security.create_refresh_token("demo")
+    db = SessionLocal()
+    assert revoked_tokens.revoke(db, jti, expires_at)
+
+    # A fresh process loads the persisted ids, and the primary key makes a
+    # second revocation of the same id report reuse.
+    reloaded = RevocationList()
+    reloaded.load(db)
+    assert reloaded.is_revoked(jti)
+    assert not RevocationList().revoke(db, jti, expires_at)
+    db.close()